@@ -1,16 +1,22 @@
 from __future__ import annotations
 
 import argparse
-import json
+import copy
+import hashlib
 import os
 import re
 import string
 import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
+import orjson
 import requests
 from bs4 import BeautifulSoup
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
@@ -32,6 +38,39 @@ SECTION_DETAIL_PARENT_RE = re.compile(
     r"Required\s+(?:recitation|discussion|lab)\s+session\s+for\s+students\s+enrolled\s+in\s+([A-Z]{3,4})\s+([A-Z]?\d{4})",
     re.I,
 )
+SUBJECT_HREF_RE = re.compile(r"/subj/([A-Z0-9_]+)/_")
+TERM_TOKEN_RE = re.compile(r"\b(Spring|Summer|Fall)\d{4}")
+TERM_COMPACT_RE = re.compile(r"^(Spring|Summer|Fall)(\d{4})$")
+TERM_SPACED_RE = re.compile(r"^(Spring|Summer|Fall)\s?(\d{4})$")
+
+# Row / time parsing patterns (evaluated for every line of every listing)
+HHMM_DIGITS_RE = re.compile(r"\d{3,4}")
+TIME_12H_RE = re.compile(r"(\d{1,2}):(\d{2})\s*([ap]m)")
+TIME_24H_RE = re.compile(r"(\d{1,2}):(\d{2})")
+RANGE_AMPM_RE = re.compile(
+    r"(\d{1,2}):(\d{2})\s*([ap]m)?\s*(?:-|to)\s*(\d{1,2}):(\d{2})\s*([ap]m)?",
+    re.I,
+)
+RANGE_24H_RE = re.compile(r"\b(\d{1,2}):(\d{2})\s*(?:-|to)\s*(\d{1,2}):(\d{2})\b")
+RANGE_DIGITS_RE = re.compile(r"\b(\d{3,4})\s*(?:-|to)\s*(\d{3,4})\b")
+SINGLE_AMPM_RE = re.compile(r"\b(\d{1,2}:\d{2}\s*[ap]m)\b", re.I)
+SINGLE_24H_RE = re.compile(r"\b(\d{1,2}:\d{2})\b")
+SINGLE_DIGITS_RE = re.compile(r"\b(\d{3,4})\b")
+ROOM_TRAILER_RE = re.compile(r"^(.*\b\d+)\s*([A-Z])$")
+LONE_CAPITAL_RE = re.compile(r"[A-Z]")
+LEGEND_RE = re.compile(r"\bL\s+Code\b")
+# One alternation for the "Activity" peek line: group 1 is the component keyword, if any.
+ACTIVITY_LINE_RE = re.compile(
+    r"\b(?:(?-i:Activity)|(LECTURE|SEMINAR|LAB|RECITATION|INDEPEND|PRACTICUM|WORKSHOP|STUDIO))\b",
+    re.I,
+)
+ACTIVITY_LINE_KINDS = frozenset({"LECTURE", "SEMINAR", "LAB", "RECITATION"})
+# Components that can act as a recitation's parent lecture, even at 0 credits
+PRIMARY_COMPONENTS = frozenset({"LECTURE", "SEMINAR", "WORKSHOP", "STUDIO"})
+WS_RE = re.compile(r"\s+")
+
+# Plain-text listing columns, left to right as they appear in the header row
+LISTING_COLUMNS = ("Number", "Sec", "Call#", "Pts", "Title", "Day", "Time", "Room", "Building", "Faculty")
 
 DAY_MAP = {
     "M": "Mon",
@@ -49,15 +88,15 @@ DAY_MAP = {
 
 def normalize_term(term_str: str) -> str:
     t = term_str.strip().replace(" ", "")
-    m = re.match(r"^(Spring|Summer|Fall)(\d{4})$", t)
+    m = TERM_COMPACT_RE.match(t)
     if not m:
         raise ValueError("Term must look like 'Fall2025' or 'Fall 2025'")
     return f"{m.group(1)}{m.group(2)}"
 
 def term_to_sis_code(term_str: str) -> str:
-    m = re.match(r"^(Spring|Summer|Fall)\s?(\d{4})$", term_str.strip())
+    m = TERM_SPACED_RE.match(term_str.strip())
     if not m:
-        m = re.match(r"^(Spring|Summer|Fall)(\d{4})$", term_str.replace(" ", ""))
+        m = TERM_COMPACT_RE.match(term_str.replace(" ", ""))
     semester, year = m.group(1), m.group(2)
     return f"{year}{TERM_SEMESTER_CODE[semester]}"
 
@@ -65,27 +104,123 @@ def term_human(term_str: str) -> str:
     t = normalize_term(term_str)
     return f"{t[:-4]} {t[-4:]}"
 
+# Rough first/last month each term's listings are live
+TERM_MONTHS = {"Spring": (1, 5), "Summer": (5, 8), "Fall": (9, 12)}
+
+def term_phase(term_str: str, now: Optional[datetime] = None) -> str:
+    """'past', 'current' or 'future' relative to `now` (default: today), by month."""
+    t = normalize_term(term_str)
+    first, last = TERM_MONTHS[t[:-4]]
+    year = int(t[-4:])
+    now = now or datetime.now()
+    ym = (now.year, now.month)
+    if ym > (year, last):
+        return "past"
+    if ym < (year, first):
+        return "future"
+    return "current"
+
 # -------------
 # HTTP helpers
 # -------------
 
-def polite_sleep(throttle: float):
-    if throttle and throttle > 0:
-        time.sleep(throttle)
+class _HostThrottle:
+    """
+    Per-host politeness: requests to one host start at least `throttle` seconds apart.
+    Slots are handed out under a lock, so concurrent callers queue up instead of all
+    sleeping the full interval; time spent parsing between requests counts toward the gap.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, host: str, throttle: float) -> None:
+        if not throttle or throttle <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + throttle
+        if slot > now:
+            time.sleep(slot - now)
+
+_THROTTLE = _HostThrottle()
+
+def make_session(cache: bool = False) -> requests.Session:
+    """
+    Plain requests.Session by default. With cache=True, use requests-cache (optional
+    dependency) so repeat runs read unchanged DOC pages from a local SQLite file.
+    """
+    if cache:
+        try:
+            from requests_cache import CachedSession
+        except ImportError:
+            print("[warn] requests-cache is not installed; continuing without an HTTP cache")
+        else:
+            return CachedSession(".sis_cache", backend="sqlite", expire_after=3600)
+    return requests.Session()
 
-def polite_get(session: requests.Session, url: str, throttle: float = 0.4) -> requests.Response:
-    polite_sleep(throttle)
-    resp = session.get(url, headers=HEADERS, timeout=30)
+def _served_from_cache(session: requests.Session, url: str, headers: Dict[str, str]) -> bool:
+    """True when a requests-cache session holds a fresh entry for `url`, i.e. no network hit."""
+    cache = getattr(session, "cache", None)
+    if cache is None:
+        return False
+    cached = cache.get_response(cache.create_key(requests.Request("GET", url, headers=headers)))
+    return cached is not None and not cached.is_expired
+
+def polite_get(session: requests.Session, url: str, throttle: float = 0.4,
+               extra_headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    headers = {**HEADERS, **extra_headers} if extra_headers else HEADERS
+    # Politeness is for the server; pages answered from the local cache skip the wait
+    if not _served_from_cache(session, url, headers):
+        _THROTTLE.wait(urlparse(url).netloc, throttle)
+    resp = session.get(url, headers=headers, timeout=30)
     resp.raise_for_status()
     return resp
 
+# url -> (ETag, Last-Modified, body) of the last 200 that carried validators.
+# Lets long-lived processes (the Streamlit app) re-scrape with conditional GETs.
+_VALIDATED_MAX = 2048
+_validated: OrderedDict[str, Tuple[Optional[str], Optional[str], str]] = OrderedDict()
+_validated_lock = threading.Lock()
+
 @retry(
     wait=wait_exponential(multiplier=0.8, min=0.5, max=8),
     stop=stop_after_attempt(5),
     retry=retry_if_exception_type((requests.RequestException,))
 )
 def fetch_text(session: requests.Session, url: str, throttle: float = 0.4) -> str:
-    return polite_get(session, url, throttle).text
+    """
+    GET a page as text. Plain sessions send If-None-Match / If-Modified-Since for URLs
+    seen before and reuse the remembered body on 304; requests-cache sessions
+    (which have a .cache) already revalidate on their own, so they are left alone.
+    """
+    if hasattr(session, "cache"):
+        return polite_get(session, url, throttle).text
+
+    with _validated_lock:
+        known = _validated.get(url)
+    conditional: Dict[str, str] = {}
+    if known:
+        etag, modified, _ = known
+        if etag:
+            conditional["If-None-Match"] = etag
+        if modified:
+            conditional["If-Modified-Since"] = modified
+
+    resp = polite_get(session, url, throttle, conditional)
+    if resp.status_code == 304 and known:
+        return known[2]
+
+    text = resp.text
+    etag, modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    if etag or modified:
+        with _validated_lock:
+            _validated[url] = (etag, modified, text)
+            _validated.move_to_end(url)
+            while len(_validated) > _VALIDATED_MAX:
+                _validated.popitem(last=False)
+    return text
 
 # -----------------------
 # Subject discovery (A–Z)
@@ -104,15 +239,12 @@ def discover_subjects_for_term(term: str, session: requests.Session, throttle: f
         html = fetch_text(session, url, throttle)
         soup = BeautifulSoup(html, "html.parser")
 
-        for a in soup.find_all("a"):
-            if (a.get_text(strip=True) or "") == term_norm:
-                href = a.get("href") or ""
-                m = re.search(r"/subj/([A-Z0-9_]+)/_", href)
-                if not m:
-                    continue
-                code = m.group(1)
+        # Let bs4 apply the href pattern first; only subject links get their text extracted
+        for a in soup.find_all("a", href=SUBJECT_HREF_RE):
+            if a.get_text(strip=True) == term_norm:
+                code = SUBJECT_HREF_RE.search(a["href"]).group(1)
                 parent_text = a.parent.get_text(" ", strip=True) if a.parent else ""
-                name = re.split(r"\b(Spring|Summer|Fall)\d{4}", parent_text)[0].strip(" ,:\u00A0")
+                name = TERM_TOKEN_RE.split(parent_text)[0].strip(" ,:\u00A0")
                 subjects[code] = name if name else code
 
     return [{"code": c, "name": subjects[c]} for c in sorted(subjects.keys())]
@@ -123,13 +255,11 @@ def save_subjects_file(path: str, term: str, subjects: List[Dict[str, str]]) ->
         "generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
         "subjects": subjects,
     }
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    write_json(path, payload)
 
 def load_subject_codes_from_file(path: str) -> List[str]:
-    with open(path, "r", encoding="utf-8") as f:
-        js = json.load(f)
+    with open(path, "rb") as f:
+        js = orjson.loads(f.read())
     return [s["code"] for s in js.get("subjects", [])]
 
 # -------------------------------------------
@@ -148,33 +278,21 @@ def _detect_columns(header_line: str) -> Dict[str, slice]:
             raise ValueError(f"Column '{name}' not found in header.")
         return idx
 
-    starts = {
-        "Number": col_pos("Number"),
-        "Sec": col_pos("Sec"),
-        "Call#": col_pos("Call#"),
-        "Pts": col_pos("Pts"),
-        "Title": col_pos("Title"),
-        "Day": col_pos("Day"),
-        "Time": col_pos("Time"),
-        "Room": col_pos("Room"),
-        "Building": col_pos("Building"),
-        "Faculty": col_pos("Faculty"),
-    }
-    keys = ["Number", "Sec", "Call#", "Pts", "Title", "Day", "Time", "Room", "Building", "Faculty"]
+    starts = {k: col_pos(k) for k in LISTING_COLUMNS}
     slices: Dict[str, slice] = {}
-    for i, k in enumerate(keys):
+    for i, k in enumerate(LISTING_COLUMNS):
         start = starts[k]
-        end = len(header_line) if i == len(keys) - 1 else starts[keys[i + 1]]
+        end = len(header_line) if i == len(LISTING_COLUMNS) - 1 else starts[LISTING_COLUMNS[i + 1]]
         slices[k] = slice(start, end)
     return slices
 
+# NBSP -> space; en/em/horizontal-bar/figure/minus/non-breaking hyphen -> "-"
+_DASH_TABLE = str.maketrans("\u00A0\u2013\u2014\u2015\u2012\u2212\u2011", " ------")
+
 def _normalize_dashes(s: str) -> str:
     if not s:
         return ""
-    s = s.replace("\u00A0", " ")
-    for ch in ["\u2013", "\u2014", "\u2015", "\u2012", "\u2212", "\u2011"]:
-        s = s.replace(ch, "-")
-    return " ".join(s.split())
+    return " ".join(s.translate(_DASH_TABLE).split())
 
 def _to_24h(hh: int, mm: int, ampm: Optional[str]) -> str:
     if ampm:
@@ -187,7 +305,7 @@ def _to_24h(hh: int, mm: int, ampm: Optional[str]) -> str:
 
 def _parse_hhmm_digits(token: str) -> Optional[str]:
     t = token.strip()
-    if not re.fullmatch(r"\d{3,4}", t):
+    if not HHMM_DIGITS_RE.fullmatch(t):
         return None
     hh = int(t[:-2])
     mm = int(t[-2:])
@@ -195,6 +313,7 @@ def _parse_hhmm_digits(token: str) -> Optional[str]:
         return f"{hh:02d}:{mm:02d}"
     return None
 
+@lru_cache(maxsize=4096)
 def parse_time_label(s: str) -> Tuple[Optional[int], str]:
     """
     Accepts: 1410, 900, 09:00, 1:10 PM, TBA
@@ -203,15 +322,20 @@ def parse_time_label(s: str) -> Tuple[Optional[int], str]:
     if not s or s.strip().lower() in {"tba", "tbd"}:
         return (None, "TBA")
 
+    # Already canonical 'HH:MM' (the common case from the 24h patterns): no normalizing or regex
+    if len(s) == 5 and s[2] == ":" and s.isascii() and s[:2].isdigit() and s[3:].isdigit():
+        if s[:2] <= "23" and s[3:] < "60":
+            return (int(s[:2] + s[3:]), s)
+
     t = _normalize_dashes(s).strip().lower().replace(".", "")
 
-    m = re.fullmatch(r"(\d{1,2}):(\d{2})\s*([ap]m)", t)
+    m = TIME_12H_RE.fullmatch(t)
     if m:
         hh, mm, ap = int(m.group(1)), int(m.group(2)), m.group(3)
         lab = _to_24h(hh, mm, ap)
         return (int(lab.replace(":", "")), lab)
 
-    m = re.fullmatch(r"(\d{1,2}):(\d{2})", t)
+    m = TIME_24H_RE.fullmatch(t)
     if m:
         hh, mm = int(m.group(1)), int(m.group(2))
         if 0 <= hh <= 23 and 0 <= mm < 60:
@@ -235,10 +359,7 @@ def parse_timerange_any(s: str) -> Tuple[Tuple[Optional[int], str], Tuple[Option
         return ((None, "TBA"), (None, "TBA"))
 
     # 1) AM/PM range (allow AM/PM on one side only → propagate)
-    m = re.search(
-        r"(\d{1,2}):(\d{2})\s*([ap]m)?\s*(?:-|to)\s*(\d{1,2}):(\d{2})\s*([ap]m)?",
-        s_norm, re.I
-    )
+    m = RANGE_AMPM_RE.search(s_norm)
     if m:
         h1, m1, a1 = int(m.group(1)), int(m.group(2)), (m.group(3) or "").lower()
         h2, m2, a2 = int(m.group(4)), int(m.group(5)), (m.group(6) or "").lower()
@@ -251,7 +372,7 @@ def parse_timerange_any(s: str) -> Tuple[Tuple[Optional[int], str], Tuple[Option
             return ((i1, lab1), (i2, lab2))
 
     # 2) 24h range
-    m = re.search(r"\b(\d{1,2}):(\d{2})\s*(?:-|to)\s*(\d{1,2}):(\d{2})\b", s_norm)
+    m = RANGE_24H_RE.search(s_norm)
     if m:
         h1, m1, h2, m2 = int(m.group(1)), int(m.group(2)), int(m.group(3)), int(m.group(4))
         if (0 <= h1 <= 23 and 0 <= m1 < 60 and 0 <= h2 <= 23 and 0 <= m2 < 60):
@@ -262,7 +383,7 @@ def parse_timerange_any(s: str) -> Tuple[Tuple[Optional[int], str], Tuple[Option
                 return ((i1, lab1), (i2, lab2))
 
     # 3) HHMM digits range
-    m = re.search(r"\b(\d{3,4})\s*(?:-|to)\s*(\d{3,4})\b", s_norm)
+    m = RANGE_DIGITS_RE.search(s_norm)
     if m:
         l1 = _parse_hhmm_digits(m.group(1))
         l2 = _parse_hhmm_digits(m.group(2))
@@ -272,19 +393,19 @@ def parse_timerange_any(s: str) -> Tuple[Tuple[Optional[int], str], Tuple[Option
                 return ((i1, l1), (i2, l2))
 
     # 4) Single time (duplicate)
-    m = re.search(r"\b(\d{1,2}:\d{2}\s*[ap]m)\b", s_norm, re.I)
+    m = SINGLE_AMPM_RE.search(s_norm)
     if m:
         i, lab = parse_time_label(m.group(1))
         if i is not None:
             return ((i, lab), (i, lab))
 
-    m = re.search(r"\b(\d{1,2}:\d{2})\b", s_norm)
+    m = SINGLE_24H_RE.search(s_norm)
     if m:
         i, lab = parse_time_label(m.group(1))
         if i is not None:
             return ((i, lab), (i, lab))
 
-    m = re.search(r"\b(\d{3,4})\b", s_norm)
+    m = SINGLE_DIGITS_RE.search(s_norm)
     if m:
         i, lab = parse_time_label(m.group(1))
         if i is not None:
@@ -296,6 +417,7 @@ def parse_timerange_any(s: str) -> Tuple[Tuple[Optional[int], str], Tuple[Option
 
     return ((None, "TBA"), (None, "TBA"))
 
+@lru_cache(maxsize=1024)
 def _credits_to_range(pts: str) -> Tuple[Optional[float], Optional[float]]:
     s = (pts or "").strip()
     if not s:
@@ -312,10 +434,14 @@ def _credits_to_range(pts: str) -> Tuple[Optional[float], Optional[float]]:
     except ValueError:
         return (None, None)
 
+@lru_cache(maxsize=256)
+def _day_tokens(day_field: Optional[str]) -> Tuple[str, ...]:
+    # Whitespace is never a DAY_MAP key, so the lookup filter already drops it
+    return tuple(DAY_MAP[d] for d in (day_field or "").upper() if d in DAY_MAP)
+
 def _split_days(day_field: str) -> List[str]:
-    s = (day_field or "").strip().upper()
-    s = re.sub(r"\s+", "", s)
-    return [DAY_MAP[d] for d in s if d in DAY_MAP]
+    # A listing only has a handful of distinct day strings ("MW", "TR", ...); each row gets its own list
+    return list(_day_tokens(day_field))
 
 def _is_real_course_row(number: str, sec: str, calln: str, title: str) -> bool:
     """
@@ -349,8 +475,8 @@ def _repair_location(room: str, building: str) -> tuple[Optional[str], Optional[
         return (None, "To be announced")
 
     # Off-by-one: trailing single uppercase in room & lowercase start in building
-    if r and re.fullmatch(r".*\b\d+\s*[A-Z]$", r) and b and b[:1].islower():
-        m = re.match(r"^(.*\b\d+)\s*([A-Z])$", r)
+    if r and b and b[:1].islower():
+        m = ROOM_TRAILER_RE.match(r)
         if m:
             r_main, trailer = m.group(1).strip(), m.group(2)
             b = (trailer + b)
@@ -358,7 +484,7 @@ def _repair_location(room: str, building: str) -> tuple[Optional[str], Optional[
             r = r_main
 
     # If room is just a lone capital and building starts lowercase → move it
-    if r and re.fullmatch(r"[A-Z]", r) and b and b[:1].islower():
+    if r and LONE_CAPITAL_RE.fullmatch(r) and b and b[:1].islower():
         b = r + b
         b = b[0].upper() + b[1:]
         r = ""
@@ -393,6 +519,28 @@ def _coerce_pm_if_needed(start_label: Optional[str], end_label: Optional[str], l
 
     return (bump(start_label), bump(end_label))
 
+def _scan_activity_line(line: str) -> Tuple[bool, Optional[str]]:
+    """
+    Single pass over the line after a course row.
+    Returns (is_activity_line, component): the line is an activity line if it says
+    "Activity" or names a LECTURE/SEMINAR/LAB/RECITATION; component is the first keyword.
+    """
+    is_activity = False
+    component = None
+    for m in ACTIVITY_LINE_RE.finditer(line):
+        kind = m.group(1)
+        if kind is None:
+            is_activity = True
+        else:
+            kind = kind.upper()
+            if component is None:
+                component = kind
+            if kind in ACTIVITY_LINE_KINDS:
+                is_activity = True
+        if is_activity and component:
+            break
+    return (is_activity, component if is_activity else None)
+
 def parse_subject_text_page(text_html: str, subject_code: str, term_label: str) -> List[Dict]:
     """
     Given the _<TERM>_text.html content, parse into a list of section dicts.
@@ -400,7 +548,7 @@ def parse_subject_text_page(text_html: str, subject_code: str, term_label: str)
     soup = BeautifulSoup(text_html, "html.parser")
     raw = soup.get_text("\n", strip=False)
 
-    lines = [ln.rstrip("\n") for ln in raw.splitlines()]
+    lines = raw.splitlines()
     header_idx = -1
     for i, ln in enumerate(lines):
         if "Number" in ln and "Call#" in ln and "Faculty" in ln:
@@ -411,8 +559,12 @@ def parse_subject_text_page(text_html: str, subject_code: str, term_label: str)
 
     header = lines[header_idx]
     slices = _detect_columns(header)
+    col_slices = tuple(slices[k] for k in LISTING_COLUMNS)
 
     sections: List[Dict] = []
+    # A course's sections sit on consecutive rows; build its code once per run
+    last_number: Optional[str] = None
+    course_code = ""
 
     i = header_idx + 1
     while i < len(lines):
@@ -420,19 +572,11 @@ def parse_subject_text_page(text_html: str, subject_code: str, term_label: str)
         i += 1
         if not ln.strip():
             continue
-        if re.search(r"\bL\s+Code\b", ln):
+        if LEGEND_RE.search(ln):
             break
 
-        number = ln[slices["Number"]].strip()
-        sec = ln[slices["Sec"]].strip()
-        calln = ln[slices["Call#"]].strip()
-        pts = ln[slices["Pts"]].strip()
-        title = ln[slices["Title"]].strip()
-        day = ln[slices["Day"]].strip()
-        time_rng = ln[slices["Time"]].strip()
-        room_raw = ln[slices["Room"]].strip()
-        building_raw = ln[slices["Building"]].strip()
-        faculty = ln[slices["Faculty"]].strip()
+        (number, sec, calln, pts, title, day, time_rng,
+         room_raw, building_raw, faculty) = [ln[sl].strip() for sl in col_slices]
 
         # Drop obvious banners/continuations
         if not _is_real_course_row(number, sec, calln, title):
@@ -464,22 +608,22 @@ def parse_subject_text_page(text_html: str, subject_code: str, term_label: str)
         # Peek for "Activity"
         component = None
         if i < len(lines):
-            nxt = lines[i]
-            if re.search(r"\bActivity\b", nxt) or re.search(r"\bLECTURE\b|\bSEMINAR\b|\bLAB\b|\bRECITATION\b", nxt, re.I):
-                m = re.search(r"\b(LECTURE|SEMINAR|LAB|RECITATION|INDEPEND|PRACTICUM|WORKSHOP|STUDIO)\b", nxt, re.I)
-                if m:
-                    component = m.group(1).upper()
+            is_activity, component = _scan_activity_line(lines[i])
+            if is_activity:
                 i += 1
 
         # Location repair
         room, building = _repair_location(room_raw, building_raw)
 
+        if number != last_number:
+            last_number, course_code = number, f"{subject_code} {number}"
+
         sections.append({
             "university": "Columbia University",
             "term": term_label,
             "subject": subject_code,
             "number": number,
-            "course_code": f"{subject_code} {number}",
+            "course_code": course_code,
             "section": sec,
             "crn": calln,
             "title": title,
@@ -496,7 +640,7 @@ def parse_subject_text_page(text_html: str, subject_code: str, term_label: str)
             },
             "instructor": faculty or None,
             "component": component,
-            "is_recitation": bool(RECITATION_SEC_RE.match(sec)) or (component == "RECITATION" and (credits_min == 0 or credits_min is None)),
+            "is_recitation": (component == "RECITATION" and (credits_min == 0 or credits_min is None)) or bool(RECITATION_SEC_RE.match(sec)),
             "parent_course_code": None,
             "detail_url": None,
             "short_desc": None,
@@ -526,17 +670,18 @@ def try_link_recitation_parent(session: requests.Session, subj: str, number: str
 
 def link_recitations(sections: List[Dict], term_code: str, session: requests.Session) -> List[Dict]:
     def norm(s: Optional[str]) -> str:
-        return re.sub(r"\s+", " ", (s or "").strip().lower())
+        return WS_RE.sub(" ", (s or "").strip().lower())
 
-    lecture_index: Dict[Tuple[str, str], List[str]] = {}
+    # (subject, title) -> course codes in first-seen order (dict keys as an ordered set)
+    lecture_index: Dict[Tuple[str, str], Dict[str, None]] = {}
     for s in sections:
-        if not s.get("is_recitation"):
-            if (s.get("credits_min") or 0) > 0 or (s.get("component") in ("LECTURE", "SEMINAR", "WORKSHOP", "STUDIO")):
-                key = (s["subject"], norm(s["title"]))
-                lecture_index.setdefault(key, [])
-                cc = s["course_code"]
-                if cc not in lecture_index[key]:
-                    lecture_index[key].append(cc)
+        if s.get("is_recitation"):
+            continue
+        if not s.get("detail_url"):
+            s["detail_url"] = build_section_detail_url(s["subject"], s["number"], term_code, s["section"])
+        if (s.get("credits_min") or 0) > 0 or s.get("component") in PRIMARY_COMPONENTS:
+            key = (s["subject"], norm(s["title"]))
+            lecture_index.setdefault(key, {})[s["course_code"]] = None
 
     for s in sections:
         if not s.get("is_recitation"):
@@ -547,21 +692,42 @@ def link_recitations(sections: List[Dict], term_code: str, session: requests.Ses
         parent = try_link_recitation_parent(session, subj, number, sec, term_code)
         if not parent:
             key = (subj, norm(s["title"]))
-            candidates = lecture_index.get(key, [])
-            parent = candidates[0] if candidates else None
+            parent = next(iter(lecture_index.get(key, ())), None)
         if parent:
             s["parent_course_code"] = parent
 
-    for s in sections:
-        if not s.get("detail_url"):
-            s["detail_url"] = build_section_detail_url(s["subject"], s["number"], term_code, s["section"])
-
     return sections
 
 # ----------------
 # Top-level scrape
 # ----------------
 
+# (subject, term label) -> (listing digest, parsed rows). A re-scrape of an unchanged
+# listing (e.g. a 304 from fetch_text) skips BeautifulSoup and the row parser.
+_PARSED_MAX = 512
+_parsed_listings: OrderedDict[Tuple[str, str], Tuple[bytes, List[Dict]]] = OrderedDict()
+_parsed_lock = threading.Lock()
+
+def _parse_listing_memo(text_html: str, subject_code: str, term_label: str) -> List[Dict]:
+    digest = hashlib.blake2b(text_html.encode("utf-8"), digest_size=16).digest()
+    key = (subject_code, term_label)
+    with _parsed_lock:
+        hit = _parsed_listings.get(key)
+        if hit is not None and hit[0] == digest:
+            _parsed_listings.move_to_end(key)
+    # link_recitations fills in fields on the rows, so callers always get rows the memo doesn't share
+    if hit is not None and hit[0] == digest:
+        return copy.deepcopy(hit[1])
+
+    rows = parse_subject_text_page(text_html, subject_code, term_label)
+    stored = copy.deepcopy(rows)
+    with _parsed_lock:
+        _parsed_listings[key] = (digest, stored)
+        _parsed_listings.move_to_end(key)
+        while len(_parsed_listings) > _PARSED_MAX:
+            _parsed_listings.popitem(last=False)
+    return rows
+
 def scrape_subject(subject_code: str, term: str, session: requests.Session, throttle: float = 0.4) -> List[Dict]:
     term_norm = normalize_term(term)
     term_code = term_to_sis_code(term)
@@ -582,27 +748,55 @@ def scrape_subject(subject_code: str, term: str, session: requests.Session, thro
     text_url = urljoin(f"{BASE}/", (text_link or "").strip())
     text_html = fetch_text(session, text_url, throttle)
 
-    sections = parse_subject_text_page(text_html, subject_code, term_label)
+    sections = _parse_listing_memo(text_html, subject_code, term_label)
     sections = link_recitations(sections, term_code, session)
     return sections
 
-def scrape_many(subject_codes: List[str], term: str, session: requests.Session, throttle: float = 0.4) -> List[Dict]:
-    all_sections: List[Dict] = []
-    for code in subject_codes:
+def scrape_many(subject_codes: List[str], term: str, session: requests.Session, throttle: float = 0.4,
+                workers: int = 4) -> List[Dict]:
+    """
+    Scrape up to `workers` subjects at once so one page's latency overlaps the next
+    request. Requests to DOC still start at most one per `throttle` seconds (the host
+    throttle is shared), and results keep the order of `subject_codes`.
+    """
+    def one(code: str) -> List[Dict]:
         try:
-            secs = scrape_subject(code, term, session, throttle)
-            all_sections.extend(secs)
+            return scrape_subject(code, term, session, throttle)
         except requests.HTTPError as e:
             if e.response is not None and e.response.status_code == 404:
                 print(f"[warn] {code}: no listing for {term_human(term)}")
-                continue
+                return []
             raise
+
+    if workers <= 1 or len(subject_codes) <= 1:
+        results = [one(code) for code in subject_codes]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(subject_codes))) as pool:
+            results = list(pool.map(one, subject_codes))
+
+    all_sections: List[Dict] = []
+    for secs in results:
+        all_sections.extend(secs)
     return all_sections
 
+def _ensure_parent_dir(path: str) -> None:
+    # A bare filename ("out.jsonl") has no directory part to create
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
 def write_json(path: str, payload) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    _ensure_parent_dir(path)
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+
+def write_jsonl(path: str, records: List[Dict]) -> None:
+    """One JSON object per line; encodes record by record instead of one big buffer."""
+    _ensure_parent_dir(path)
+    with open(path, "wb") as f:
+        for rec in records:
+            f.write(orjson.dumps(rec))
+            f.write(b"\n")
 
 # -----------------------------
 # CLI (useful for quick testing)
@@ -617,10 +811,11 @@ def main():
     parser.add_argument("--subjects", nargs="*", default=None, help="Explicit subject codes to scrape (overrides subjects-file).")
     parser.add_argument("--scrape", action="store_true", help="After discovery, scrape subjects.")
     parser.add_argument("--max-subjects", type=int, default=None, help="Optional cap when scraping many subjects.")
-    parser.add_argument("-o", "--out", default="data/sample_output.json", help="Where to write scraped JSON.")
+    parser.add_argument("-o", "--out", default="data/sample_output.json", help="Where to write scraped JSON (a .jsonl path writes one section per line).")
+    parser.add_argument("--cache", action="store_true", help="Cache GETs in .sis_cache.sqlite for 1 hour (needs requests-cache).")
     args = parser.parse_args()
 
-    session = requests.Session()
+    session = make_session(args.cache)
 
     subjects_to_scrape: List[str] = []
     discovered = None
@@ -644,7 +839,10 @@ def main():
 
     if args.scrape:
         sections = scrape_many(subjects_to_scrape, args.term, session)
-        write_json(args.out, sections)
+        if args.out.endswith(".jsonl"):
+            write_jsonl(args.out, sections)
+        else:
+            write_json(args.out, sections)
         print(f"[ok] wrote {len(sections)} sections to {args.out}")
 
     return 0
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import re
 from datetime import datetime, time as dtime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Tuple
 
 import altair as alt
+import orjson
 import pandas as pd
 import requests
 import streamlit as st
@@ -14,8 +17,9 @@ from scraper import (
     scrape_many,
     term_to_sis_code,
     term_human,
+    term_phase,
 )
-from validators import normalize_sections, flatten_for_display, DISPLAY_COLS, write_json
+from validators import Section, normalize_sections, flatten_for_display, DISPLAY_COLS, write_json
 
 # ----------------
 # Page config & UI
@@ -47,62 +51,127 @@ hr { border: none; border-top: 1px solid #e5e7eb; margin: 0.75rem 0 1rem; }
 # --------------
 # Cache helpers
 # --------------
+@st.cache_resource
+def shared_session() -> requests.Session:
+    # One pooled session per server process, so cache misses reuse keep-alive connections
+    return requests.Session()
+
+# TTLs follow how often a term's DOC pages change (see scraper.term_phase):
+# past terms are frozen, the live term churns daily, upcoming ones rarely move.
 @st.cache_data(show_spinner=False, ttl=60*60)  # 1 hour
+def _discover_live(term: str) -> List[Dict[str, str]]:
+    return discover_subjects_for_term(term, shared_session())
+
+@st.cache_data(show_spinner=False, ttl=7*24*60*60)  # 1 week
+def _discover_past(term: str) -> List[Dict[str, str]]:
+    return discover_subjects_for_term(term, shared_session())
+
 def cached_discover_subjects(term: str) -> List[Dict[str, str]]:
-    session = requests.Session()
-    return discover_subjects_for_term(term, session)
+    fetch = _discover_past if term_phase(term) == "past" else _discover_live
+    return fetch(term)
 
 @st.cache_data(show_spinner=True, ttl=60*5)  # 5 min
+def _scrape_current(subjects: List[str], term: str) -> List[Dict]:
+    return scrape_many(subjects, term, shared_session())
+
+@st.cache_data(show_spinner=True, ttl=60*60)  # 1 hour
+def _scrape_future(subjects: List[str], term: str) -> List[Dict]:
+    return scrape_many(subjects, term, shared_session())
+
+@st.cache_data(show_spinner=True, ttl=7*24*60*60)  # 1 week
+def _scrape_past(subjects: List[str], term: str) -> List[Dict]:
+    return scrape_many(subjects, term, shared_session())
+
+_SCRAPE_BY_PHASE = {"past": _scrape_past, "current": _scrape_current, "future": _scrape_future}
+
 def cached_scrape(subjects: List[str], term: str) -> List[Dict]:
-    session = requests.Session()
-    return scrape_many(subjects, term, session)
+    return _SCRAPE_BY_PHASE[term_phase(term)](subjects, term)
+
+def payload_digest(raw: List[Dict]) -> str:
+    return hashlib.blake2b(orjson.dumps(raw), digest_size=16).hexdigest()
+
+# Everything keyed on a payload digest lives as long as the sections it was derived from
+DIGEST_CACHE_TTL = 60*30  # 30 min
+DIGEST_CACHE_MAX = 8      # recent scrapes kept per digest-keyed cache (sections, deck, CSV, ...)
+
+@st.cache_data(show_spinner=False, ttl=DIGEST_CACHE_TTL, max_entries=DIGEST_CACHE_MAX)
+def cached_sections(digest: str, _raw: List[Dict]) -> Tuple[List[Section], pd.DataFrame]:
+    """normalize + flatten once per distinct payload; keyed on its digest (_raw itself is not hashed)."""
+    sections = normalize_sections(_raw)
+    # columns= picks and orders DISPLAY_COLS during construction, so no reindex pass afterwards
+    return sections, optimize_dtypes(pd.DataFrame.from_records(flatten_for_display(sections), columns=DISPLAY_COLS))
 
 # -----------------
 # Helper functions
 # -----------------
 WEEKDAY_ORDER = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-
-def ensure_display_cols(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    for c in set(DISPLAY_COLS) - set(out.columns):
-        out[c] = None
-    return out.reindex(columns=DISPLAY_COLS)
+BROWSE_PAGE_SIZE = 25  # courses per page in the Search tab's browse list
+# Only what the browse expanders render; the page's rows are sliced to these before the groupby
+BROWSE_COLS = ["course_code", "title", "is_recitation", "section", "crn", "parent_course_code", "component",
+               "instructor", "days", "start_time", "end_time", "location", "detail_url"]
+
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Narrow the session-state frame: float32 credits, categorical low-cardinality text, bool is_recitation."""
+    dtypes = {c: "float32" for c in ("credits", "credits_min", "credits_max") if c in df.columns}
+    dtypes.update({c: "category" for c in ("term", "subject", "component", "days") if c in df.columns})
+    if "is_recitation" in df.columns:
+        dtypes["is_recitation"] = "bool"
+        df = df.assign(is_recitation=df["is_recitation"].fillna(False))
+    return df.astype(dtypes)
 
 def compute_metrics(df: pd.DataFrame) -> Dict[str, int]:
+    recitations = int(df["is_recitation"].sum()) if "is_recitation" in df.columns else 0
     return {
         "sections": len(df),
         "courses": df["course_code"].nunique() if "course_code" in df.columns else 0,
         "subjects": df["subject"].nunique() if "subject" in df.columns else 0,
-        "recitations": int((df.get("is_recitation", pd.Series(dtype=bool)) == True).sum()),
-        "primaries": int((df.get("is_recitation", pd.Series(dtype=bool)) == False).sum()),
+        "recitations": recitations,
+        "primaries": len(df) - recitations if "is_recitation" in df.columns else 0,
     }
 
+def _text_col(df: pd.DataFrame, col: str) -> pd.Series:
+    """String view of a column with missing values as "" (not "nan")."""
+    s = df[col]
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(object)  # fillna("") would need "" as a category
+    return s.fillna("").astype(str)
+
 def explode_days(df: pd.DataFrame) -> pd.DataFrame:
-    rows = []
-    for _, r in df.iterrows():
-        days_raw = r.get("days") or ""
-        days = [d.strip() for d in str(days_raw).split(",") if d.strip()]
-        for d in days:
-            rows.append({
-                "course_code": r.get("course_code"),
-                "is_recitation": r.get("is_recitation"),
-                "day": d,
-                "start_time": r.get("start_time"),
-                "end_time": r.get("end_time"),
-                "credits": r.get("credits") if pd.notnull(r.get("credits")) else (r.get("credits_max") or r.get("credits_min")),
-                "instructor": r.get("instructor"),
-                "building": (r.get("location") or ""),
-                "component": r.get("component"),
-            })
-    return pd.DataFrame(rows)
-
-def hhmm_to_hour(hhmm: Optional[str]) -> Optional[float]:
-    if hhmm is None or pd.isna(hhmm): return None
-    try:
-        h, m = [int(x) for x in str(hhmm).split(":")]
-        return h + m / 60.0
-    except Exception:
-        return None
+    """One row per (section, meeting day), built with split/explode rather than iterrows."""
+    credits = df.get("credits")
+    if credits is not None:
+        for c in ("credits_max", "credits_min"):
+            if c in df.columns:
+                credits = credits.fillna(df[c])
+    out = pd.DataFrame({
+        "course_code": df.get("course_code"),
+        "is_recitation": df.get("is_recitation"),
+        "day": _text_col(df, "days").str.split(","),
+        "start_time": df.get("start_time"),
+        "end_time": df.get("end_time"),
+        "credits": credits,
+        "instructor": df.get("instructor"),
+        "building": _text_col(df, "location"),
+        "component": df.get("component"),
+    }, index=df.index).explode("day")
+    out["day"] = out["day"].str.strip()
+    return out[out["day"] != ""].reset_index(drop=True)
+
+def doc_links(urls: pd.Series) -> pd.Series:
+    """Markdown "[open](url)" per row, "" where the URL is missing."""
+    return ("[open](" + urls.astype(str) + ")").where(urls.notna(), "")
+
+def search_haystack(df: pd.DataFrame) -> pd.Series:
+    """Lowercased title/instructor/location/course_code per row, built once per scrape for keyword search."""
+    hay = _text_col(df, "title")
+    for c in ("instructor", "location", "course_code"):
+        hay = hay + " " + _text_col(df, c)
+    return hay.str.lower()
+
+def hhmm_to_minutes(hhmm: pd.Series) -> pd.Series:
+    """Vectorized 'HH:MM' -> minutes since midnight; NaN where missing or unparseable."""
+    parts = hhmm.fillna("").astype(str).str.extract(r"^(\d+):(\d+)$").astype(float)
+    return parts[0] * 60 + parts[1]
 
 def make_pipeline_dot() -> str:
     return r"""
@@ -123,30 +192,22 @@ digraph G {
 }
 """
 
-def _to_float(x) -> Optional[float]:
-    try:
-        if x is None or (isinstance(x, float) and pd.isna(x)):
-            return None
-        return float(x)
-    except Exception:
-        return None
-
-def credit_bounds(row: pd.Series) -> Tuple[Optional[float], Optional[float]]:
-    c  = _to_float(row.get("credits"))
-    cmin = _to_float(row.get("credits_min"))
-    cmax = _to_float(row.get("credits_max"))
-
-    if c is not None:
-        return c, c
-    if cmin is None and cmax is None:
-        return None, None
-    if cmin is None:
-        cmin = cmax
-    if cmax is None:
-        cmax = cmin
-    if cmax < cmin:
-        cmin, cmax = cmax, cmin
-    return cmin, cmax
+def credit_bounds(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """
+    Per-row (min, max) credits as two float Series: a fixed `credits` wins; otherwise
+    credits_min/credits_max, each filling in for the other and swapped if reversed.
+    NaN where nothing is known.
+    """
+    def num(col: str) -> pd.Series:
+        if col not in df.columns:
+            return pd.Series(float("nan"), index=df.index)
+        return pd.to_numeric(df[col], errors="coerce").astype(float)
+
+    c, lo, hi = num("credits"), num("credits_min"), num("credits_max")
+    lo, hi = lo.fillna(hi), hi.fillna(lo)
+    swap = hi < lo
+    lo, hi = lo.mask(swap, hi), hi.mask(swap, lo)
+    return c.fillna(lo), c.fillna(hi)
 
 def build_html_deck(term_label: str, metrics: Dict[str, int], sample_html_table: str) -> str:
     """
@@ -214,6 +275,28 @@ def build_html_deck(term_label: str, metrics: Dict[str, int], sample_html_table:
 </body>
 </html>"""
 
+@st.cache_data(show_spinner=False, ttl=DIGEST_CACHE_TTL, max_entries=DIGEST_CACHE_MAX)
+def cached_deck_html(term_label: str, digest: str, _df: pd.DataFrame) -> str:
+    """Deck for one scrape, keyed on term + payload digest so reruns reuse it."""
+    sample_cols = [c for c in ["course_code", "title", "credits", "days", "start_time", "end_time", "instructor", "location"] if c in _df.columns]
+    sample_html = _df[sample_cols].head(18).to_html(index=False, escape=False)
+    return build_html_deck(term_label, compute_metrics(_df), sample_html)
+
+@st.cache_data(show_spinner=False, ttl=DIGEST_CACHE_TTL, max_entries=DIGEST_CACHE_MAX)
+def cached_metrics(digest: str, _df: pd.DataFrame) -> Dict[str, int]:
+    """Metric cards for one scrape; recomputed only when the payload digest changes."""
+    return compute_metrics(_df)
+
+@st.cache_data(show_spinner=False, ttl=DIGEST_CACHE_TTL, max_entries=DIGEST_CACHE_MAX)
+def cached_csv_bytes(digest: str, _df: pd.DataFrame) -> bytes:
+    """CSV export for one scrape, serialized once per payload digest instead of every rerun."""
+    return _df.to_csv(index=False).encode("utf-8")
+
+@st.cache_data(show_spinner=False, ttl=DIGEST_CACHE_TTL, max_entries=DIGEST_CACHE_MAX)
+def cached_parquet_bytes(digest: str, _df: pd.DataFrame) -> bytes:
+    """Parquet export for one scrape; keeps the float32/category dtypes and dictionary-encodes repeated strings."""
+    return _df.to_parquet(index=False, engine="pyarrow", compression="zstd")
+
 # ----------------
 # Sidebar controls
 # ----------------
@@ -258,8 +341,14 @@ go = st.sidebar.button("🚀 Scrape now")
 
 if "sections_raw" not in st.session_state:
     st.session_state["sections_raw"] = []
+if "sections" not in st.session_state:
+    st.session_state["sections"] = []
+if "sections_digest" not in st.session_state:
+    st.session_state["sections_digest"] = ""
 if "sections_df" not in st.session_state:
     st.session_state["sections_df"] = pd.DataFrame()
+if "sections_hay" not in st.session_state:
+    st.session_state["sections_hay"] = pd.Series(dtype=str)
 
 if go:
     if all_flag:
@@ -274,13 +363,14 @@ if go:
     with st.spinner("Scraping…"):
         raw = cached_scrape(subject_codes, term_input)
 
-    sections = normalize_sections(raw)
-    rows = flatten_for_display(sections)
-    df = pd.DataFrame(rows)
-    df = ensure_display_cols(df)
+    digest = payload_digest(raw)
+    sections, df = cached_sections(digest, raw)
 
     st.session_state["sections_raw"] = raw
+    st.session_state["sections_digest"] = digest
+    st.session_state["sections"] = sections
     st.session_state["sections_df"] = df
+    st.session_state["sections_hay"] = search_haystack(df)
 
 # ------------------------
 # Main tabs (demo-friendly)
@@ -294,140 +384,122 @@ tab_search, tab_visuals, tab_how, tab_export = st.tabs(["🔎 Search", "📊 Vis
 # ===========
 # SEARCH TAB
 # ===========
+@st.fragment
+def search_tab() -> None:
+    """Filters + browse list. A fragment, so filter widgets rerun only this tab, not the sidebar/pipeline."""
+    st.subheader("Filters")
+
+    f1, f2, f3, f4 = st.columns([1, 1, 2, 2])
+    with f1:
+        credits_min = st.number_input("Min credits", value=0.0, step=0.5)
+    with f2:
+        credits_max = st.number_input("Max credits", value=6.0, step=0.5)
+
+    with f3:
+        day_choices = st.multiselect("Days", WEEKDAY_ORDER, default=[], help="Filter by meeting days.")
+    with f4:
+        time_filter = st.checkbox("Filter by time window", value=False)
+        if time_filter:
+            c1, c2 = st.columns(2)
+            with c1:
+                start_after = st.time_input("Start at or after", value=dtime(0, 0))
+            with c2:
+                end_before = st.time_input("End at or before", value=dtime(23, 59))
+        else:
+            start_after = None
+            end_before = None
+
+    include_recitations_in_time = st.checkbox(
+        "Apply day/time filter to **recitations as well**",
+        value=False,
+        help="If off, day/time filter applies only to primary sections (is_recitation==False)."
+    )
+    query = st.text_input("Keyword (title/instructor/building)", value="")
+
+    # Read-only from here on: masks are computed against the stored frame, no defensive copy
+    df = st.session_state["sections_df"]
+
+    # Unknown credits are NaN on both sides; NaN compares False, so those rows pass
+    cmin, cmax = credit_bounds(df)
+    mask = ~((cmax < credits_min) | (cmin > credits_max))
+
+    # Day and time checks fuse into one mask; recitations are exempt unless opted in
+    day_time_mask = pd.Series(True, index=df.index)
+    if day_choices:
+        # Whole comma-separated tokens only, so "Mon" never matches inside another word
+        day_pat = r"(?:^|,)\s*(?:" + "|".join(map(re.escape, day_choices)) + r")\s*(?:,|$)"
+        day_time_mask &= _text_col(df, "days").str.contains(day_pat, regex=True)
+    if time_filter:
+        start_after_min = start_after.hour * 60 + start_after.minute
+        end_before_min = end_before.hour * 60 + end_before.minute
+        # Missing/unparseable times are NaN and fail both comparisons
+        day_time_mask &= (hhmm_to_minutes(df["start_time"]) >= start_after_min) & \
+                         (hhmm_to_minutes(df["end_time"]) <= end_before_min)
+    if not include_recitations_in_time:
+        day_time_mask |= df["is_recitation"]
+    mask &= day_time_mask
+
+    if query.strip():
+        q = query.strip().lower()
+        # Costliest predicate last, and only over rows the cheaper filters kept
+        if mask.any():
+            hay = st.session_state["sections_hay"][mask]
+            mask[mask] = hay.str.contains(q, regex=False)
+
+    filtered = df[mask].reset_index(drop=True)
+
+    st.markdown(f"**{len(filtered)}** matching sections")
+    st.dataframe(filtered, use_container_width=True, hide_index=True)  # already exactly DISPLAY_COLS
+
+    st.subheader("Browse by Course (expand for sections & recitations)")
+    # Render one page of courses at a time; an "ALL" scrape can have hundreds
+    course_codes = sorted(filtered["course_code"].dropna().unique()) if "course_code" in filtered.columns else []
+    n_pages = max(1, -(-len(course_codes) // BROWSE_PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1) if n_pages > 1 else 1
+    page_codes = course_codes[(page - 1) * BROWSE_PAGE_SIZE: page * BROWSE_PAGE_SIZE]
+    if n_pages > 1:
+        st.caption(f"Courses {(page - 1) * BROWSE_PAGE_SIZE + 1}–{(page - 1) * BROWSE_PAGE_SIZE + len(page_codes)} "
+                   f"of {len(course_codes)}")
+    page_rows = filtered.loc[filtered["course_code"].isin(page_codes), [c for c in BROWSE_COLS if c in filtered.columns]]
+    grouped = page_rows.groupby("course_code", sort=True) if page_codes else []
+    for course_code, g in grouped:
+        title = g["title"].dropna().unique() if "title" in g.columns else []
+        pretty_title = title[0] if len(title) else ""
+        chip = f"<span class='badge lec-badge'>{pretty_title}</span>"
+        st.markdown(f"### {course_code} &nbsp; {chip}", unsafe_allow_html=True)
+
+        with st.expander("Show sections"):
+            is_rec = g["is_recitation"]
+            prim = g[~is_rec]
+            recs = g[is_rec]
+
+            if not prim.empty:
+                st.markdown("**Primary**")
+                cols = ["section", "crn", "component", "instructor",
+                        "days", "start_time", "end_time", "location", "detail_url"]
+                prim_display = prim[[c for c in cols if c in prim.columns]].rename(columns={"detail_url": "DOC link"})
+                if "DOC link" in prim_display.columns:
+                    prim_display["DOC link"] = doc_links(prim_display["DOC link"])
+                st.dataframe(prim_display, use_container_width=True, hide_index=True)
+            else:
+                st.write("_No primary sections shown in current filter._")
+
+            if not recs.empty:
+                st.markdown("**Linked recitations/labs/discussions**")
+                cols = ["section", "parent_course_code", "component", "instructor",
+                        "days", "start_time", "end_time", "location", "detail_url"]
+                rec_display = recs[[c for c in cols if c in recs.columns]].rename(columns={"detail_url": "DOC link"})
+                if "DOC link" in rec_display.columns:
+                    rec_display["DOC link"] = doc_links(rec_display["DOC link"])
+                st.dataframe(rec_display, use_container_width=True, hide_index=True)
+            else:
+                st.write("_No recitations linked or shown in current filter._")
+
 with tab_search:
     if st.session_state["sections_df"].empty:
         st.info("No results yet. Choose subjects on the left and click **Scrape now**.")
     else:
-        st.subheader("Filters")
-
-        f1, f2, f3, f4 = st.columns([1, 1, 2, 2])
-        with f1:
-            credits_min = st.number_input("Min credits", value=0.0, step=0.5)
-        with f2:
-            credits_max = st.number_input("Max credits", value=6.0, step=0.5)
-
-        with f3:
-            WEEKDAY_ORDER = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-            day_choices = st.multiselect("Days", WEEKDAY_ORDER, default=[], help="Filter by meeting days.")
-        with f4:
-            time_filter = st.checkbox("Filter by time window", value=False)
-            if time_filter:
-                c1, c2 = st.columns(2)
-                with c1:
-                    start_after = st.time_input("Start at or after", value=dtime(0, 0))
-                with c2:
-                    end_before = st.time_input("End at or before", value=dtime(23, 59))
-            else:
-                start_after = None
-                end_before = None
-
-        include_recitations_in_time = st.checkbox(
-            "Apply day/time filter to **recitations as well**",
-            value=False,
-            help="If off, day/time filter applies only to primary sections (is_recitation==False)."
-        )
-        query = st.text_input("Keyword (title/instructor/building)", value="")
-
-        df = st.session_state["sections_df"].copy()
-
-        bounds = df.apply(lambda r: pd.Series(credit_bounds(r), index=["__cmin", "__cmax"]), axis=1)
-        df = pd.concat([df, bounds], axis=1)
-
-        def credits_overlap(row) -> bool:
-            cmin, cmax = row.get("__cmin"), row.get("__cmax")
-            if pd.isna(cmin) and pd.isna(cmax):
-                return True
-            if pd.isna(cmin): cmin = cmax
-            if pd.isna(cmax): cmax = cmin
-            return not (cmax < credits_min or cmin > credits_max)
-
-        mask = df.apply(credits_overlap, axis=1)
-
-        def row_matches_day(row) -> bool:
-            if not day_choices:
-                return True
-            days = [d.strip() for d in str(row.get("days") or "").split(",") if d.strip()]
-            if not days:
-                return False
-            return any(d in days for d in day_choices)
-
-        def hhmm_to_minutes(hhmm: str) -> Optional[int]:
-            try:
-                h, m = [int(x) for x in str(hhmm).split(":")]
-                return h * 60 + m
-            except Exception:
-                return None
-
-        def row_matches_time(row) -> bool:
-            if not time_filter:
-                return True
-            s, e = row.get("start_time"), row.get("end_time")
-            s_min, e_min = hhmm_to_minutes(s), hhmm_to_minutes(e)
-            if s_min is None or e_min is None:
-                return False
-            if start_after is not None and s_min < (start_after.hour * 60 + start_after.minute):
-                return False
-            if end_before is not None and e_min > (end_before.hour * 60 + end_before.minute):
-                return False
-            return True
-
-        if include_recitations_in_time:
-            mask &= df.apply(lambda r: row_matches_day(r) and row_matches_time(r), axis=1)
-        else:
-            only_primary = df.get("is_recitation", False) == False
-            day_time_mask = df.apply(lambda r: row_matches_day(r) and row_matches_time(r), axis=1)
-            mask &= (~only_primary) | (only_primary & day_time_mask)
-
-        if query.strip():
-            q = query.strip().lower()
-            def matches_q(row) -> bool:
-                hay = " ".join([
-                    str(row.get("title") or ""),
-                    str(row.get("instructor") or ""),
-                    str(row.get("location") or ""),
-                    str(row.get("course_code") or ""),
-                ]).lower()
-                return q in hay
-            mask &= df.apply(matches_q, axis=1)
-
-        filtered = df[mask].copy().reset_index(drop=True)
-
-        st.markdown(f"**{len(filtered)}** matching sections")
-        st.dataframe(filtered.reindex(columns=DISPLAY_COLS), use_container_width=True, hide_index=True)
-
-        st.subheader("Browse by Course (expand for sections & recitations)")
-        grouped = filtered.groupby("course_code", sort=True) if "course_code" in filtered.columns else []
-        for course_code, g in grouped:
-            title = g["title"].dropna().unique() if "title" in g.columns else []
-            pretty_title = title[0] if len(title) else ""
-            chip = f"<span class='badge lec-badge'>{pretty_title}</span>"
-            st.markdown(f"### {course_code} &nbsp; {chip}", unsafe_allow_html=True)
-
-            with st.expander("Show sections"):
-                prim = g[g.get("is_recitation", False) == False].copy()
-                recs = g[g.get("is_recitation", False) == True].copy()
-
-                if not prim.empty:
-                    st.markdown("**Primary**")
-                    cols = ["section", "crn", "component", "instructor",
-                            "days", "start_time", "end_time", "location", "detail_url"]
-                    prim_display = prim[[c for c in cols if c in prim.columns]].rename(columns={"detail_url": "DOC link"})
-                    if "DOC link" in prim_display.columns:
-                        prim_display["DOC link"] = prim_display["DOC link"].apply(lambda u: f"[open]({u})" if pd.notnull(u) else "")
-                    st.dataframe(prim_display, use_container_width=True, hide_index=True)
-                else:
-                    st.write("_No primary sections shown in current filter._")
-
-                if not recs.empty:
-                    st.markdown("**Linked recitations/labs/discussions**")
-                    cols = ["section", "parent_course_code", "component", "instructor",
-                            "days", "start_time", "end_time", "location", "detail_url"]
-                    rec_display = recs[[c for c in cols if c in recs.columns]].rename(columns={"detail_url": "DOC link"})
-                    if "DOC link" in rec_display.columns:
-                        rec_display["DOC link"] = rec_display["DOC link"].apply(lambda u: f"[open]({u})" if pd.notnull(u) else "")
-                    st.dataframe(rec_display, use_container_width=True, hide_index=True)
-                else:
-                    st.write("_No recitations linked or shown in current filter._")
+        search_tab()
 
 # ===========
 # VISUALS TAB
@@ -440,7 +512,7 @@ with tab_visuals:
         st.graphviz_chart(make_pipeline_dot(), use_container_width=True)
 
         st.subheader("Key metrics")
-        met = compute_metrics(st.session_state["sections_df"])
+        met = cached_metrics(st.session_state["sections_digest"], st.session_state["sections_df"])
         c1, c2, c3, c4, c5 = st.columns(5)
         c1.metric("Sections", met["sections"])
         c2.metric("Courses", met["courses"])
@@ -451,37 +523,41 @@ with tab_visuals:
         st.markdown("<hr>", unsafe_allow_html=True)
         st.subheader("Distributions & schedule")
 
-        base_df = st.session_state["sections_df"].copy()
-        exploded = explode_days(base_df)
+        exploded = explode_days(st.session_state["sections_df"])
         if exploded.empty:
             st.info("No day/time data available for charts.")
         else:
-            exploded["start_hour"] = exploded["start_time"].apply(hhmm_to_hour)
+            exploded["start_hour"] = hhmm_to_minutes(exploded["start_time"]) / 60.0
             exploded = exploded[exploded["day"].isin(WEEKDAY_ORDER)]
 
-            prim = exploded[exploded.get("is_recitation", False) == False]
+            prim = exploded[~exploded["is_recitation"]]
             if not prim.empty:
                 weekday_counts = prim.groupby("day").size().reindex(WEEKDAY_ORDER, fill_value=0).reset_index(name="count")
                 st.markdown("**Sections by weekday (primaries)**")
                 st.bar_chart(weekday_counts.set_index("day"))
 
-            credits_df = exploded.dropna(subset=["credits"])
-            if not credits_df.empty:
+            # Bin and count here so the charts ship a handful of rows, not every exploded section
+            credits = exploded["credits"].dropna()
+            if not credits.empty:
+                credits_counts = (credits // 1).astype(int).value_counts().sort_index() \
+                    .rename_axis("credits").reset_index(name="count")
                 st.markdown("**Credits distribution**")
-                hist = alt.Chart(credits_df).mark_bar().encode(
-                    x=alt.X("credits:Q", bin=alt.Bin(step=1), title="Credits"),
-                    y=alt.Y("count()", title="Sections")
+                hist = alt.Chart(credits_counts).mark_bar().encode(
+                    x=alt.X("credits:O", title="Credits"),
+                    y=alt.Y("count:Q", title="Sections")
                 ).properties(height=220, width="container")
                 st.altair_chart(hist, use_container_width=True)
 
             heat_df = exploded.dropna(subset=["start_hour"])
             if not heat_df.empty:
+                heat_counts = heat_df.assign(start_hour=(heat_df["start_hour"] // 1).astype(int)) \
+                    .groupby(["day", "start_hour"]).size().reset_index(name="count")
                 st.markdown("**Schedule heatmap (start hours by weekday)**")
-                heat = alt.Chart(heat_df).mark_rect().encode(
+                heat = alt.Chart(heat_counts).mark_rect().encode(
                     x=alt.X("day:N", sort=WEEKDAY_ORDER, title="Day"),
-                    y=alt.Y("start_hour:Q", bin=alt.Bin(step=1), title="Start hour"),
-                    color=alt.Color("count():Q", title="Sections"),
-                    tooltip=["day:N", alt.Tooltip("start_hour:Q", format=".1f"), alt.Tooltip("count():Q")]
+                    y=alt.Y("start_hour:O", title="Start hour"),
+                    color=alt.Color("count:Q", title="Sections"),
+                    tooltip=["day:N", alt.Tooltip("start_hour:O", title="Start hour"), alt.Tooltip("count:Q", title="Sections")]
                 ).properties(height=260, width="container")
                 st.altair_chart(heat, use_container_width=True)
 
@@ -513,29 +589,36 @@ with tab_export:
 
         with colA:
             if st.button("💾 Save full JSON to data/columbia_sections.json"):
-                sections = normalize_sections(st.session_state["sections_raw"])
                 os.makedirs("data", exist_ok=True)
-                write_json("data/columbia_sections.json", sections)
+                write_json("data/columbia_sections.json", st.session_state["sections"])
                 st.success("Saved to data/columbia_sections.json")
+            if st.button("💾 Save Parquet to data/columbia_sections.parquet"):
+                os.makedirs("data", exist_ok=True)
+                with open("data/columbia_sections.parquet", "wb") as f:
+                    f.write(cached_parquet_bytes(st.session_state["sections_digest"], st.session_state["sections_df"]))
+                st.success("Saved to data/columbia_sections.parquet")
 
         with colB:
-            csv = st.session_state["sections_df"].to_csv(index=False).encode("utf-8")
+            csv = cached_csv_bytes(st.session_state["sections_digest"], st.session_state["sections_df"])
             st.download_button("⬇️ Download all sections (CSV)", data=csv,
                                file_name="all_sections.csv", mime="text/csv")
+            # Passed as a callable, so the Parquet bytes are only built when someone clicks
+            st.download_button("⬇️ Download all sections (Parquet)",
+                               data=lambda d=st.session_state["sections_digest"], f=st.session_state["sections_df"]:
+                                   cached_parquet_bytes(d, f),
+                               file_name="all_sections.parquet", mime="application/vnd.apache.parquet")
 
         with colC:
-            df = st.session_state["sections_df"]
-            metrics = compute_metrics(df)
-            sample_cols = [c for c in ["course_code", "title", "credits", "days", "start_time", "end_time", "instructor", "location"] if c in df.columns]
-            sample = df[sample_cols].head(18)
-            sample_html = sample.to_html(index=False, escape=False)
-
-            deck_html = build_html_deck(term_label, metrics, sample_html)
+            deck_key = (term_label, st.session_state["sections_digest"])
+            deck_html = cached_deck_html(*deck_key, st.session_state["sections_df"])
 
-            os.makedirs("docs", exist_ok=True)
+            # Rewrite the file only when the deck changes, not on every rerun
             out_path = "docs/demo_deck.html"
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write(deck_html)
+            if st.session_state.get("deck_written") != deck_key or not os.path.exists(out_path):
+                os.makedirs("docs", exist_ok=True)
+                with open(out_path, "w", encoding="utf-8") as f:
+                    f.write(deck_html)
+                st.session_state["deck_written"] = deck_key
 
             st.download_button("🎞️ Download demo deck (HTML)", data=deck_html.encode("utf-8"),
                                file_name="demo_deck.html", mime="text/html")
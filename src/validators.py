@@ -1,18 +1,20 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass, field, asdict
+import sys
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 
+import orjson
+
 WEEKDAY_ORDER = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     campus: Optional[str] = None
     building: Optional[str] = None
     room: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Section:
     university: str
     term: str                     # "Fall 2025"
@@ -39,6 +41,12 @@ class Section:
 
     def to_row(self) -> Dict[str, Any]:
         """Flat row for DataFrame display."""
+        loc = self.location
+        if loc:
+            b, r = loc.building, loc.room
+            location = f"{b} {r}" if b and r else (b or r or "")
+        else:
+            location = None
         return {
             "course_code": self.course_code,
             "title": self.title,
@@ -57,21 +65,25 @@ class Section:
             "days": ", ".join(self.days) if self.days else None,
             "start_time": self.start_time,
             "end_time": self.end_time,
-            "location": " ".join([x for x in [self.location.building, self.location.room] if x]) if self.location else None,
+            "location": location,
             "detail_url": self.detail_url,
             "short_desc": self.short_desc,
             "status": self.status,
         }
 
+def _intern(s: Optional[str]) -> Optional[str]:
+    """Share one string object for values that repeat across nearly every section."""
+    return sys.intern(s) if isinstance(s, str) else s
+
 def normalize_sections(raw_sections: List[Dict[str, Any]]) -> List[Section]:
     """Convert raw dicts (from scraper) into validated Section dataclass instances."""
     normalized: List[Section] = []
     for r in raw_sections:
         loc = r.get("location") or {}
         section = Section(
-            university=r.get("university", "Columbia University"),
-            term=r.get("term"),
-            subject=r.get("subject"),
+            university=_intern(r.get("university", "Columbia University")),
+            term=_intern(r.get("term")),
+            subject=_intern(r.get("subject")),
             number=r.get("number"),
             course_code=r.get("course_code"),
             section=r.get("section"),
@@ -84,17 +96,17 @@ def normalize_sections(raw_sections: List[Dict[str, Any]]) -> List[Section]:
             start_time=r.get("start_time"),
             end_time=r.get("end_time"),
             location=Location(
-                campus=loc.get("campus"),
-                building=loc.get("building"),
+                campus=_intern(loc.get("campus")),
+                building=_intern(loc.get("building")),
                 room=loc.get("room"),
             ),
             instructor=r.get("instructor"),
-            component=r.get("component"),
+            component=_intern(r.get("component")),
             is_recitation=bool(r.get("is_recitation")),
             parent_course_code=r.get("parent_course_code"),
             detail_url=r.get("detail_url"),
             short_desc=r.get("short_desc"),
-            status=r.get("status"),
+            status=_intern(r.get("status")),
         )
         normalized.append(section)
     return normalized
@@ -111,6 +123,6 @@ DISPLAY_COLS = [
 ]
 
 def write_json(path: str, sections: List[Section]) -> None:
-    payload = [asdict(s) for s in sections]
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    """orjson walks the dataclasses natively, so no asdict() copy is built first."""
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(sections, option=orjson.OPT_INDENT_2))
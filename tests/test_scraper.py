@@ -0,0 +1,73 @@
+import io
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3 import HTTPResponse
+
+import scraper
+
+
+class _FakeDOC(BaseAdapter):
+    """Answers every GET with a small HTML body, counting how often the 'network' is hit."""
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        self.calls += 1
+        raw = HTTPResponse(body=io.BytesIO(b"<p>listing</p>"), status=200,
+                           headers={"Content-Type": "text/html"},
+                           preload_content=False, request_url=request.url)
+        return HTTPAdapter().build_response(request, raw)
+
+    def close(self):
+        pass
+
+
+URL = "https://doc.example.edu/subj/COMS/_Fall2025_text.html"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Fresh throttle state; records requested sleeps instead of sleeping."""
+    calls = []
+    monkeypatch.setattr(scraper, "_THROTTLE", scraper._HostThrottle())
+    monkeypatch.setattr(scraper.time, "sleep", calls.append)
+    return calls
+
+
+def test_plain_session_throttles_each_fetch(sleeps):
+    session = requests.Session()
+    adapter = _FakeDOC()
+    session.mount("https://", adapter)
+
+    scraper.polite_get(session, URL, throttle=5)
+    assert sleeps == []  # first request to the host goes straight out
+    scraper.polite_get(session, URL, throttle=5)
+    assert adapter.calls == 2
+    assert len(sleeps) == 1 and sleeps[0] > 4
+
+    # Other hosts keep their own schedule
+    scraper.polite_get(session, "https://other.example.edu/", throttle=5)
+    assert len(sleeps) == 1
+
+
+def test_cached_refetch_skips_throttle(sleeps):
+    requests_cache = pytest.importorskip("requests_cache")
+    session = requests_cache.CachedSession("test", backend="memory", expire_after=3600)
+    adapter = _FakeDOC()
+    session.mount("https://", adapter)
+    url = URL
+
+    first = scraper.polite_get(session, url, throttle=5)
+    second = scraper.polite_get(session, url, throttle=5)
+
+    assert not first.from_cache and second.from_cache
+    assert adapter.calls == 1
+    assert sleeps == []  # the only network fetch was the first, which had no prior slot
+
+    # A real network fetch to the same host right after still waits its turn
+    scraper.polite_get(session, url + "?v=2", throttle=5)
+    assert adapter.calls == 2
+    assert len(sleeps) == 1 and sleeps[0] > 4